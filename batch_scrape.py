@@ -1,24 +1,51 @@
 #!/usr/bin/env python3
 """
 Script to batch process article URLs using the scraper.
-Reads URLs from a file and processes them one by one.
+Reads URLs from a file and processes them concurrently in-process.
 """
 
 import argparse
-import subprocess
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
 
+import requests
 
-def process_urls_from_file(url_file: str, output_dir: str = "articles", delay: float = 0.5) -> int:
+from rate_limit import RateLimiter
+from scrape_pravenc import make_session, scrape, utc_timestamp
+
+# One requests.Session per worker thread, so each worker keeps its
+# connection to the server alive across articles
+_thread_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """Return the current worker thread's Session, creating it on first use."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = make_session()
+        _thread_local.session = session
+    return session
+
+
+def _scrape_one(url: str, output_dir: str, limiter: RateLimiter, downloaded_at: str) -> Path:
+    """Scrape one URL in a worker thread and return the output path."""
+    # Be respectful to the server: requests are paced by the shared limiter
+    limiter.acquire()
+    return scrape(url, output_dir, session=_get_session(), downloaded_at=downloaded_at)
+
+
+def process_urls_from_file(url_file: str, output_dir: str = "articles", delay: float = 0.5, workers: int = 4, rate: Optional[float] = None) -> int:
     """Process all URLs from a file using the scraper."""
     url_file_path = Path(url_file)
-    
+
     if not url_file_path.exists():
         print(f"Error: URL file '{url_file}' not found", file=sys.stderr)
         return 1
-    
+
     # Read URLs from file
     try:
         with open(url_file_path, 'r', encoding='utf-8') as f:
@@ -26,51 +53,66 @@ def process_urls_from_file(url_file: str, output_dir: str = "articles", delay: f
     except Exception as e:
         print(f"Error reading URL file: {e}", file=sys.stderr)
         return 1
-    
+
     if not urls:
         print("No URLs found in file", file=sys.stderr)
         return 1
-    
-    print(f"Processing {len(urls)} URLs from: {url_file}")
+
+    # Drop repeated URLs (keeping first-seen order), then group them by host
+    # so each worker's keep-alive connection is reused for the same server
+    url_count = len(urls)
+    urls = sorted(dict.fromkeys(urls), key=lambda u: urlsplit(u).netloc)
+    total = len(urls)
+
+    try:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        print(f"Error creating output directory: {e}", file=sys.stderr)
+        return 1
+
+    # Default to the request rate of the old sequential loop with --delay
+    if rate is None:
+        rate = 1.0 / delay if delay > 0 else 0.0
+    limiter = RateLimiter(rate)
+
+    print(f"Processing {total} URLs from: {url_file}")
+    if total < url_count:
+        print(f"Skipped {url_count - total} duplicate URLs")
     print(f"Output directory: {output_dir}")
-    print(f"Delay between requests: {delay}s")
+    print(f"Rate limit: {rate:g} requests/s" if rate > 0 else "Rate limit: none")
+    print(f"Workers: {workers}")
     print("-" * 50)
-    
+
     successful = 0
     failed = 0
-    
-    for i, url in enumerate(urls, 1):
+
+    # Every article in the batch is stamped with the batch start time
+    downloaded_at = utc_timestamp()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_scrape_one, url, output_dir, limiter, downloaded_at): url for url in urls}
         try:
-            print(f"[{i}/{len(urls)}] Processing: {url}")
-            
-            # Run the scraper for this URL
-            result = subprocess.run([
-                sys.executable, "scrape_pravenc.py", 
-                "--out-dir", output_dir, 
-                url
-            ], capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print(f"    ✓ Success: {result.stdout.strip()}")
-                successful += 1
-            else:
-                print(f"    ✗ Failed: {result.stderr.strip()}")
-                failed += 1
-            
-            # Be respectful to the server
-            if i < len(urls):  # Don't delay after the last URL
-                time.sleep(delay)
-            
-        except Exception as e:
-            print(f"    ✗ Error processing {url}: {e}", file=sys.stderr)
-            failed += 1
-    
+            for i, future in enumerate(as_completed(futures), 1):
+                url = futures[future]
+                try:
+                    out_path = future.result()
+                    print(f"[{i}/{total}] ✓ Success: {url} -> {out_path}")
+                    successful += 1
+                except Exception as e:
+                    print(f"[{i}/{total}] ✗ Failed: {url}: {e}", file=sys.stderr)
+                    failed += 1
+        except BaseException:
+            # On Ctrl-C (or any other abort) drop the queued URLs; otherwise
+            # leaving the with block would wait for the whole queue to run
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
     print("-" * 50)
     print(f"Batch processing completed:")
     print(f"  Successful: {successful}")
     print(f"  Failed: {failed}")
-    print(f"  Total: {len(urls)}")
-    
+    print(f"  Total: {total}")
+
     return 0 if failed == 0 else 1
 
 
@@ -79,9 +121,13 @@ def main(argv=None) -> int:
     parser.add_argument("url_file", help="File containing article URLs (one per line)")
     parser.add_argument("--out-dir", default="articles", help="Directory to save the Markdown files")
     parser.add_argument("--delay", type=float, default=0.5, help="Delay between requests in seconds (default: 0.5)")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum requests per second across all workers (default: 1/delay)")
+    parser.add_argument("--workers", "--max-concurrency", type=int, default=4, help="Number of articles scraped in parallel (default: 4)")
     args = parser.parse_args(argv)
-    
-    return process_urls_from_file(args.url_file, args.out_dir, args.delay)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    return process_urls_from_file(args.url_file, args.out_dir, args.delay, args.workers, args.rate)
 
 
 if __name__ == "__main__":
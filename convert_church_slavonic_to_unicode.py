@@ -6,8 +6,26 @@ Script to convert Church Slavonic image references to Unicode text using the map
 import json
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# Pattern to match Church Slavonic image URLs
+# Matches both char/26526 and char/26528 patterns
+# Handles spaces and special characters in the code sequence
+_IMG_RE = re.compile(r'!\[\]\(<https://pravenc\.ru/char/(26526|26528)/([^>]+)>\)')
+
+# Pattern to match hex chunks (x followed by 2-3 hex digits) in a code sequence
+_HEX_RE = re.compile(r'x[0-9a-fA-F]{2,3}')
+
+# Substring every image URL above contains; files without it are skipped
+# before decoding or running the regex
+_IMG_SENTINEL = b'pravenc.ru/char/2652'
+
+# Size in bytes of the shortest possible image reference; smaller files are
+# not even opened
+_MIN_IMG_REF_SIZE = len('![](<https://pravenc.ru/char/26526/x>)')
+
 def load_mapping(mapping_file):
     """Load the Church Slavonic character mapping from JSON file."""
     try:
@@ -19,14 +37,21 @@ def load_mapping(mapping_file):
         print(f"❌ Error loading mapping file {mapping_file}: {e}")
         return {}
 
-def convert_church_slavonic_images(content, mapping):
-    """Convert Church Slavonic image references to Unicode text."""
-    
-    # Pattern to match Church Slavonic image URLs
-    # Matches both char/26526 and char/26528 patterns
-    # Handles spaces and special characters in the code sequence
-    pattern = r'!\[\]\(<https://pravenc\.ru/char/(26526|26528)/([^>]+)>\)'
-    
+def convert_church_slavonic_images(content, mapping, cache=None):
+    """Convert Church Slavonic image references to Unicode text.
+    
+    Returns a (converted_content, count) tuple, where count is the number of
+    image references that were replaced. If given, cache is a dict reused
+    across calls with the same mapping to memoize converted code sequences.
+    """
+    if cache is None:
+        cache = {}
+
+    def replace_chunk(match):
+        chunk = match.group()
+        # If chunk not found in mapping, keep the original chunk
+        return mapping.get(chunk, f"[{chunk}]")
+
     def replace_image(match):
         char_type = match.group(1)  # 26526 or 26528
         code_sequence = match.group(2)  # The character code sequence
@@ -38,55 +63,56 @@ def convert_church_slavonic_images(content, mapping):
         if not code_sequence:
             return ''
         
-        # Split the sequence into parts, preserving spaces
-        # First, extract hex chunks
-        hex_chunks = re.findall(r'x[0-9a-fA-F]{2,3}', code_sequence)
-        
-        # Convert each hex chunk to Unicode using the mapping
-        unicode_chars = []
-        for chunk in hex_chunks:
-            if chunk in mapping:
-                unicode_chars.append(mapping[chunk])
-            else:
-                # If chunk not found in mapping, keep the original chunk
-                unicode_chars.append(f"[{chunk}]")
-        
-        # Handle spaces: if there are spaces in the original sequence, preserve them
-        # We need to reconstruct the text with proper spacing
-        result_text = ''
-        remaining_sequence = code_sequence
-        
-        for chunk in hex_chunks:
-            # Find the position of this chunk in the remaining sequence
-            chunk_pos = remaining_sequence.find(chunk)
-            if chunk_pos > 0:
-                # There's text before this chunk (likely spaces)
-                prefix = remaining_sequence[:chunk_pos]
-                # Convert spaces to actual spaces
-                prefix = prefix.replace(' ', ' ')
-                result_text += prefix
-            
-            # Add the converted character
-            if chunk in mapping:
-                result_text += mapping[chunk]
-            else:
-                result_text += f"[{chunk}]"
+        # The same letters and words recur across articles, so reuse earlier results
+        converted = cache.get(code_sequence)
+        if converted is None:
+            # Convert each hex chunk to Unicode using the mapping; the regex engine
+            # copies the text between chunks (spaces etc.) through unchanged
+            result_text = _HEX_RE.sub(replace_chunk, code_sequence)
             
-            # Remove the processed part from remaining sequence
-            remaining_sequence = remaining_sequence[chunk_pos + len(chunk):]
-        
-        # Add any remaining text (spaces at the end)
-        if remaining_sequence:
-            remaining_sequence = remaining_sequence.replace(' ', ' ')
-            result_text += remaining_sequence
-        
-        # Wrap in span with Church Slavonic class
-        return f'<span class="cu">{result_text}</span>'
+            # Wrap in span with Church Slavonic class
+            converted = cache[code_sequence] = f'<span class="cu">{result_text}</span>'
+        return converted
     
     # Replace all Church Slavonic image references
-    converted_content = re.sub(pattern, replace_image, content)
+    # subn reports the number of replacements, so no second counting pass is needed
+    converted_content, count = _IMG_RE.subn(replace_image, content)
     
-    return converted_content
+    return converted_content, count
+
+# Mapping used by worker processes, set once per worker by _init_worker,
+# along with the worker's cache of converted code sequences
+_worker_mapping = None
+_worker_cache = None
+
+def _init_worker(mapping):
+    """Store the mapping in a worker process so it is not re-sent with every file."""
+    global _worker_mapping, _worker_cache
+    _worker_mapping = mapping
+    _worker_cache = {}
+
+def _convert_file(md_file, dry_run=False):
+    """Convert one Markdown file in a worker; return (md_file, conversions, error)."""
+    try:
+        # Read the file as bytes and skip it cheaply if it cannot contain images
+        with open(md_file, 'rb') as f:
+            data = f.read()
+        if _IMG_SENTINEL not in data:
+            return md_file, 0, None
+        content = data.decode('utf-8')
+        
+        # Convert Church Slavonic images
+        converted_content, original_images = convert_church_slavonic_images(content, _worker_mapping, _worker_cache)
+        
+        # Files without images are left untouched
+        if original_images > 0 and not dry_run:
+            # Write the converted content back as one encoded block
+            with open(md_file, 'wb', buffering=1 << 20) as f:
+                f.write(converted_content.encode('utf-8'))
+        
+        return md_file, original_images, None
+    except Exception as e:
+        return md_file, 0, e
 
 def process_markdown_files(articles_dir, mapping, dry_run=False):
     """Process all Markdown files to convert Church Slavonic images to Unicode."""
@@ -96,37 +122,38 @@ def process_markdown_files(articles_dir, mapping, dry_run=False):
         print(f"❌ Articles directory not found: {articles_dir}")
         return
     
-    md_files = list(articles_path.glob("*.md"))
-    print(f"📁 Found {len(md_files)} Markdown files to process")
+    # os.scandir yields DirEntry objects with cached type info, which is much
+    # cheaper than Path.glob on large article directories; plain str paths
+    # are also cheaper to send to the worker processes
+    md_files = []
+    skipped_files = 0
+    for entry in os.scandir(articles_dir):
+        if not entry.name.endswith('.md') or not entry.is_file(follow_symlinks=False):
+            continue
+        # Empty or tiny files cannot hold an image reference
+        if entry.stat(follow_symlinks=False).st_size < _MIN_IMG_REF_SIZE:
+            skipped_files += 1
+            continue
+        md_files.append(entry.path)
+    print(f"📁 Found {len(md_files) + skipped_files} Markdown files to process")
     
     total_conversions = 0
     processed_files = 0
     
-    for md_file in md_files:
-        try:
-            # Read the file
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Convert Church Slavonic images
-            converted_content = convert_church_slavonic_images(content, mapping)
-            
-            # Count conversions using the same pattern as the conversion function
-            original_images = len(re.findall(r'!\[\]\(<https://pravenc\.ru/char/(26526|26528)/([^>]+)>\)', content))
-            if original_images > 0:
+    # Files are independent, so convert them in parallel across CPU cores
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(mapping,)) as executor:
+        results = executor.map(partial(_convert_file, dry_run=dry_run), md_files, chunksize=16)
+        for md_file, original_images, error in results:
+            if error is not None:
+                print(f"❌ Error processing {md_file}: {error}")
+            elif original_images > 0:
                 total_conversions += original_images
                 processed_files += 1
                 
                 if not dry_run:
-                    # Write the converted content back
-                    with open(md_file, 'w', encoding='utf-8') as f:
-                        f.write(converted_content)
-                    print(f"✅ Converted {original_images} Church Slavonic images in {md_file.name}")
+                    print(f"✅ Converted {original_images} Church Slavonic images in {os.path.basename(md_file)}")
                 else:
-                    print(f"🔍 Would convert {original_images} Church Slavonic images in {md_file.name}")
-                    
-        except Exception as e:
-            print(f"❌ Error processing {md_file}: {e}")
+                    print(f"🔍 Would convert {original_images} Church Slavonic images in {os.path.basename(md_file)}")
     
     print(f"\n📊 Conversion Summary:")
     print(f"   Files processed: {processed_files}")
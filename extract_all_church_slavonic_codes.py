@@ -3,20 +3,56 @@
 Script to extract Church Slavonic character codes from both char/26526 and char/26528 URLs.
 """
 
+import mmap
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Pattern for both Church Slavonic URL types; captures the URL type and the code.
+# The URLs are ASCII, so it runs on the raw file bytes without decoding them
+_URL_RE = re.compile(rb"https://pravenc\.ru/char/(26526|26528)/([^/]+)/image\.png")
+
+# Substring shared by both URL types; files without it are skipped before
+# running the regex
+_URL_SENTINEL = b"pravenc.ru/char/2652"
+
+# Pattern to extract hex chunks (x followed by 2-3 hex digits)
+_HEX_RE = re.compile(r"x[0-9a-fA-F]{2,3}")
+
+def _scan_one(md_file):
+    """Scan one Markdown file; return (md_file, codes_26526, codes_26528, error)."""
+    codes_26526 = set()
+    codes_26528 = set()
+    try:
+        with open(md_file, 'rb') as f:
+            # mmap cannot map an empty file, and an empty file has no codes
+            if os.fstat(f.fileno()).st_size == 0:
+                return md_file, codes_26526, codes_26528, None
+            
+            # Run the regex directly over the mapped pages instead of copying
+            # the file into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                if content.find(_URL_SENTINEL) == -1:
+                    return md_file, codes_26526, codes_26528, None
+                
+                # Extract codes from both URL types in a single pass; only the
+                # matched codes are decoded
+                for url_type, code in _URL_RE.findall(content):
+                    if url_type == b"26526":
+                        codes_26526.add(code.decode('utf-8'))
+                    else:
+                        codes_26528.add(code.decode('utf-8'))
+        
+        return md_file, codes_26526, codes_26528, None
+    except Exception as e:
+        # Drop anything collected before the failure, so a bad file
+        # contributes no codes
+        return md_file, set(), set(), e
+
 def extract_church_slavonic_codes():
     """Extract all Church Slavonic character codes from Markdown files."""
     
-    # Patterns for both Church Slavonic URL types
-    patterns = [
-        r"https://pravenc\.ru/char/26526/([^/]+)/image\.png",
-        r"https://pravenc\.ru/char/26528/([^/]+)/image\.png"
-    ]
-    
-    all_codes = set()
     char_26526_codes = set()
     char_26528_codes = set()
     
@@ -29,48 +65,33 @@ def extract_church_slavonic_codes():
     print("=" * 50)
     
     # Process all Markdown files
-    md_files = list(articles_dir.glob("*.md"))
+    md_files = [entry.path for entry in os.scandir(articles_dir)
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith('.md')]
     print(f"Processing {len(md_files)} Markdown files...")
     
-    for md_file in md_files:
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # Extract codes from char/26526 URLs
-                matches_26526 = re.findall(patterns[0], content)
-                for code in matches_26526:
-                    char_26526_codes.add(code)
-                    all_codes.add(code)
-                
-                # Extract codes from char/26528 URLs
-                matches_26528 = re.findall(patterns[1], content)
-                for code in matches_26528:
-                    char_26528_codes.add(code)
-                    all_codes.add(code)
-                    
-        except Exception as e:
-            print(f"Error processing {md_file}: {e}")
+    # Files are independent, so scan them in parallel and merge the sets here;
+    # chunksize amortizes the inter-process overhead over many small files
+    with ProcessPoolExecutor() as executor:
+        for md_file, codes_26526, codes_26528, error in executor.map(_scan_one, md_files, chunksize=32):
+            if error is not None:
+                print(f"Error processing {md_file}: {error}")
+            char_26526_codes |= codes_26526
+            char_26528_codes |= codes_26528
+    all_codes = char_26526_codes | char_26528_codes
     
     # Extract hex chunks from all codes
-    all_hex_chunks = set()
     char_26526_hex_chunks = set()
     char_26528_hex_chunks = set()
     
-    # Pattern to extract hex chunks (x followed by 2-3 hex digits)
-    hex_pattern = r"x[0-9a-fA-F]{2,3}"
-    
-    for code in char_26526_codes:
-        hex_chunks = re.findall(hex_pattern, code)
-        for chunk in hex_chunks:
-            char_26526_hex_chunks.add(chunk)
-            all_hex_chunks.add(chunk)
-    
-    for code in char_26528_codes:
-        hex_chunks = re.findall(hex_pattern, code)
-        for chunk in hex_chunks:
-            char_26528_hex_chunks.add(chunk)
-            all_hex_chunks.add(chunk)
+    # Scan each unique code once, even if it appears under both URL types,
+    # and attribute its chunks using the sets the code was found in
+    for code in all_codes:
+        hex_chunks = _HEX_RE.findall(code)
+        if code in char_26526_codes:
+            char_26526_hex_chunks.update(hex_chunks)
+        if code in char_26528_codes:
+            char_26528_hex_chunks.update(hex_chunks)
+    all_hex_chunks = char_26526_hex_chunks | char_26528_hex_chunks
     
     # Print statistics
     print(f"\n📊 Extraction Results:")
@@ -84,24 +105,21 @@ def extract_church_slavonic_codes():
     # Save all hex chunks
     output_file = "all_church_slavonic_hex_chunks.txt"
     with open(output_file, 'w', encoding='utf-8') as f:
-        for chunk in sorted(all_hex_chunks):
-            f.write(f"{chunk}\n")
+        f.write("".join(f"{chunk}\n" for chunk in sorted(all_hex_chunks)))
     
     print(f"\n✅ All hex chunks saved to: {output_file}")
     
     # Save char/26526 hex chunks
     output_file_26526 = "char_26526_hex_chunks.txt"
     with open(output_file_26526, 'w', encoding='utf-8') as f:
-        for chunk in sorted(char_26526_hex_chunks):
-            f.write(f"{chunk}\n")
+        f.write("".join(f"{chunk}\n" for chunk in sorted(char_26526_hex_chunks)))
     
     print(f"✅ char/26526 hex chunks saved to: {output_file_26526}")
     
     # Save char/26528 hex chunks
     output_file_26528 = "char_26528_hex_chunks.txt"
     with open(output_file_26528, 'w', encoding='utf-8') as f:
-        for chunk in sorted(char_26528_hex_chunks):
-            f.write(f"{chunk}\n")
+        f.write("".join(f"{chunk}\n" for chunk in sorted(char_26528_hex_chunks)))
     
     print(f"✅ char/26528 hex chunks saved to: {output_file_26528}")
     
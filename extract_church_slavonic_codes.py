@@ -9,29 +9,56 @@ import re
 import os
 from pathlib import Path
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Pattern to match the Church Slavonic character URLs; it runs on raw file
+# bytes, since the URLs are ASCII and decoding the whole file is wasted work
+_URL_RE = re.compile(rb'https://pravenc\.ru/char/(\d+)/([^/]+)/image\.png')
+
+# Substring every such URL contains; files without it are skipped before
+# running the regex
+_URL_SENTINEL = b'pravenc.ru/char/'
+
+# Pattern to match x followed by 2-3 hex digits
+_HEX_RE = re.compile(r'x[0-9a-fA-F]{2,3}')
 
 
 def find_church_slavonic_urls(content):
     """
-    Find all Church Slavonic character image URLs in the content.
+    Find all Church Slavonic character image URLs in the content (bytes).
     Pattern: https://pravenc.ru/char/[number]/[code]/image.png
+    Returns a list of decoded (number, code) tuples.
     """
-    # Pattern to match the Church Slavonic character URLs
-    pattern = r'https://pravenc\.ru/char/(\d+)/([^/]+)/image\.png'
-    matches = re.findall(pattern, content)
-    return matches
+    if _URL_SENTINEL not in content:
+        return []
+    return [(number.decode('ascii'), code.decode('utf-8'))
+            for number, code in _URL_RE.findall(content)]
 
 
+@lru_cache(maxsize=None)
 def extract_hex_chunks(code):
     """
     Extract hex chunks from a character code.
     Chunks are of the form: x followed by 2-3 hexadecimal digits
-    Example: xc04xecxefxebixe9 -> ['xc04', 'xec', 'xef', 'xeb', 'xe9']
+    Example: xc04xecxefxebixe9 -> ('xc04', 'xec', 'xef', 'xeb', 'xe9')
+    Results are cached, since the same codes recur across many articles;
+    a tuple is returned so the cached value cannot be mutated by callers.
     """
-    # Pattern to match x followed by 2-3 hex digits
-    pattern = r'x[0-9a-fA-F]{2,3}'
-    chunks = re.findall(pattern, code)
-    return chunks
+    return tuple(_HEX_RE.findall(code))
+
+
+def _scan_file(md_file):
+    """
+    Read one Markdown file in a worker process.
+    Returns (md_file, url_matches, error).
+    """
+    try:
+        with open(md_file, 'rb') as f:
+            content = f.read()
+        return md_file, find_church_slavonic_urls(content), None
+    except Exception as e:
+        return md_file, [], e
 
 
 def process_markdown_files(articles_dir):
@@ -52,22 +79,23 @@ def process_markdown_files(articles_dir):
     print(f"Processing Markdown files in: {articles_dir}")
     print("-" * 50)
     
-    # Process all .md files
-    for md_file in articles_path.glob("*.md"):
-        total_files += 1
-        
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+    # Process all .md files; reading and regex scanning run in parallel worker
+    # processes, while results are reported here in file order
+    md_files = [entry.path for entry in os.scandir(articles_dir)
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith('.md')]
+    with ProcessPoolExecutor() as executor:
+        for md_file, url_matches, error in executor.map(_scan_file, md_files, chunksize=32):
+            total_files += 1
             
-            # Find Church Slavonic URLs
-            url_matches = find_church_slavonic_urls(content)
+            if error is not None:
+                print(f"Error processing {md_file}: {error}")
+                continue
             
             if url_matches:
                 files_with_codes += 1
                 total_codes += len(url_matches)
                 
-                print(f"Found {len(url_matches)} codes in: {md_file.name}")
+                print(f"Found {len(url_matches)} codes in: {os.path.basename(md_file)}")
                 
                 # Extract hex chunks from each code
                 for number, code in url_matches:
@@ -75,11 +103,7 @@ def process_markdown_files(articles_dir):
                     all_hex_chunks.update(hex_chunks)
                     
                     if hex_chunks:  # Only print if we found chunks
-                        print(f"  Code: {code} -> Chunks: {hex_chunks}")
-        
-        except Exception as e:
-            print(f"Error processing {md_file}: {e}")
-            continue
+                        print(f"  Code: {code} -> Chunks: {list(hex_chunks)}")
     
     print("-" * 50)
     print(f"Summary:")
@@ -100,8 +124,8 @@ def save_hex_chunks(hex_chunks, output_file):
     
     try:
         with open(output_file, 'w', encoding='utf-8') as f:
-            for chunk in sorted_chunks:
-                f.write(chunk + '\n')
+            # Build the whole file in memory and write it in one call
+            f.write(''.join(chunk + '\n' for chunk in sorted_chunks))
         
         print(f"\nSaved {len(sorted_chunks)} unique hex chunks to: {output_file}")
         
@@ -6,27 +6,49 @@ Downloads pages 1-361 and extracts article URLs from <span class="article_title"
 
 import argparse
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
+from rate_limit import RateLimiter
 
-def fetch_html(url: str) -> str:
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
+}
+
+# Module-wide Session for direct fetch_html() calls, so repeated fetches
+# reuse a keep-alive connection instead of a new TCP+TLS handshake each
+_SESSION = requests.Session()
+
+# One requests.Session per worker thread, so each worker keeps its
+# connection to the server alive across listing pages
+_thread_local = threading.local()
+
+
+def fetch_html(url: str, session: Optional[requests.Session] = None) -> str:
     """Fetch HTML content from a URL with proper headers and encoding."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
-    }
-    resp = requests.get(url, headers=headers, timeout=30)
+    resp = (session or _SESSION).get(url, headers=_HEADERS, timeout=30)
     resp.encoding = resp.apparent_encoding or resp.encoding
     resp.raise_for_status()
     return resp.text
 
 
+def _get_session() -> requests.Session:
+    """Return the current worker thread's Session, creating it on first use."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
 def extract_article_urls_from_page(html: str, base_url: str) -> list:
     """Extract article URLs from a listing page."""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
     urls = []
     
     # Find all spans with class "article_title" that contain links
@@ -42,67 +64,87 @@ def extract_article_urls_from_page(html: str, base_url: str) -> list:
     return urls
 
 
-def extract_all_article_urls(start_page: int = 1, end_page: int = 361, output_file: str = "article_urls.txt") -> int:
+def _fetch_page_urls(url: str, base_url: str, limiter: RateLimiter) -> list:
+    """Fetch one listing page in a worker thread and return its article URLs."""
+    # Be respectful to the server: requests are paced by the shared limiter
+    limiter.acquire()
+    html = fetch_html(url, _get_session())
+    return extract_article_urls_from_page(html, base_url)
+
+
+def extract_all_article_urls(start_page: int = 1, end_page: int = 361, output_file: str = "article_urls.txt", workers: int = 8, rate: float = 2.0) -> int:
     """Extract all article URLs from pravenc.ru listing pages."""
-    all_urls = []
     base_url = "https://pravenc.ru/"
     
     print(f"Extracting article URLs from pages {start_page} to {end_page}")
     print(f"Output file: {output_file}")
+    print(f"Rate limit: {rate:g} requests/s" if rate > 0 else "Rate limit: none")
+    print(f"Workers: {workers}")
     print("-" * 50)
     
-    for page_num in range(start_page, end_page + 1):
-        try:
-            url = f"https://pravenc.ru/list.html?t_page={page_num}"
-            print(f"[{page_num}/{end_page}] Fetching: {url}")
-            
-            # Fetch the page
-            html = fetch_html(url)
-            
-            # Extract article URLs from this page
-            page_urls = extract_article_urls_from_page(html, base_url)
-            all_urls.extend(page_urls)
-            
-            print(f"    ✓ Found {len(page_urls)} articles")
-            
-            # Be respectful to the server
-            time.sleep(0.5)
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                print(f"    → Page {page_num} not found (404), stopping.")
-                break
-            else:
-                print(f"    ✗ HTTP Error {e.response.status_code}: {e}", file=sys.stderr)
-                continue
-        except Exception as e:
-            print(f"    ✗ Error processing page {page_num}: {e}", file=sys.stderr)
-            continue
+    # URLs are written as they are found, so open the output file up front
+    try:
+        f = open(output_file, 'w', encoding='utf-8')
+    except Exception as e:
+        print(f"Error opening output file: {e}", file=sys.stderr)
+        return 1
+    
+    limiter = RateLimiter(rate)
     
-    # Remove duplicates while preserving order
-    unique_urls = []
+    total_found = 0
     seen_urls = set()
-    for url in all_urls:
-        if url not in seen_urls:
-            unique_urls.append(url)
-            seen_urls.add(url)
     
-    # Save URLs to file
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for url in unique_urls:
-                f.write(url + '\n')
-        
-        print("-" * 50)
-        print(f"Successfully extracted {len(unique_urls)} unique article URLs")
-        print(f"URLs saved to: {output_file}")
-        print(f"Total URLs found: {len(all_urls)} (removed {len(all_urls) - len(unique_urls)} duplicates)")
-        
-        return 0
-        
-    except Exception as e:
+        with f:
+            futures = []
+            for page_num in range(start_page, end_page + 1):
+                url = f"https://pravenc.ru/list.html?t_page={page_num}"
+                futures.append((page_num, url, executor.submit(_fetch_page_urls, url, base_url, limiter)))
+            
+            # Pages are fetched concurrently but consumed in page order, so the
+            # output order and the stop-at-first-404 behaviour are unchanged
+            for page_num, url, future in futures:
+                try:
+                    print(f"[{page_num}/{end_page}] Fetching: {url}")
+                    
+                    # Wait for this page's worker to finish
+                    page_urls = future.result()
+                    
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 404:
+                        print(f"    → Page {page_num} not found (404), stopping.")
+                        break
+                    else:
+                        print(f"    ✗ HTTP Error {e.response.status_code}: {e}", file=sys.stderr)
+                        continue
+                except Exception as e:
+                    print(f"    ✗ Error processing page {page_num}: {e}", file=sys.stderr)
+                    continue
+                
+                # Write each URL the first time it is seen, preserving order
+                total_found += len(page_urls)
+                for article_url in page_urls:
+                    if article_url not in seen_urls:
+                        f.write(article_url + '\n')
+                        seen_urls.add(article_url)
+                
+                print(f"    ✓ Found {len(page_urls)} articles")
+    except OSError as e:
+        # A failed write (or the final flush on close) aborts the whole run
         print(f"Error saving URLs to file: {e}", file=sys.stderr)
         return 1
+    finally:
+        # Drop any pages still queued: past the end of the listing after a
+        # 404, or all of them on a write error or Ctrl-C
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    print("-" * 50)
+    print(f"Successfully extracted {len(seen_urls)} unique article URLs")
+    print(f"URLs saved to: {output_file}")
+    print(f"Total URLs found: {total_found} (removed {total_found - len(seen_urls)} duplicates)")
+    
+    return 0
 
 
 def main(argv=None) -> int:
@@ -110,9 +152,13 @@ def main(argv=None) -> int:
     parser.add_argument("--start-page", type=int, default=1, help="Starting page number (default: 1)")
     parser.add_argument("--end-page", type=int, default=361, help="Ending page number (default: 361)")
     parser.add_argument("--output", default="article_urls.txt", help="Output file for URLs (default: article_urls.txt)")
+    parser.add_argument("--workers", type=int, default=8, help="Number of pages fetched in parallel (default: 8)")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum requests per second across all workers (default: 2)")
     args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
     
-    return extract_all_article_urls(args.start_page, args.end_page, args.output)
+    return extract_all_article_urls(args.start_page, args.end_page, args.output, args.workers, args.rate)
 
 
 if __name__ == "__main__":
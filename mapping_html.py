@@ -0,0 +1,253 @@
+"""
+Shared HTML generator for the Church Slavonic character mapping pages.
+Each code is displayed with its image from pravenc.ru and an input field
+for entering the corresponding Unicode character.
+"""
+
+# Page header; CSS braces are doubled for str.format
+_HEADER_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+        }}
+        .container {{
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        h1 {{
+            color: #333;
+            text-align: center;
+            margin-bottom: 30px;
+        }}
+        .stats {{
+            background-color: #e8f4f8;
+            padding: 15px;
+            border-radius: 5px;
+            margin-bottom: 30px;
+            text-align: center;
+        }}
+        .character-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+            gap: 20px;
+            margin-top: 20px;
+        }}
+        .character-item {{
+            border: 1px solid #ddd;
+            border-radius: 8px;
+            padding: 15px;
+            background-color: #fafafa;
+            text-align: center;
+            transition: box-shadow 0.3s ease;
+        }}
+        .character-item:hover {{
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+        }}
+        .code {{
+            font-family: 'Courier New', monospace;
+            font-size: 18px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 10px;
+            background-color: #ecf0f1;
+            padding: 8px;
+            border-radius: 4px;
+        }}
+        .image-container {{
+            margin: 10px 0;
+            min-height: 60px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        .character-image {{
+            max-width: 100%;
+            max-height: 80px;
+            border: 1px solid #bdc3c7;
+            border-radius: 4px;
+            background-color: white;
+        }}
+        .url {{
+            font-family: 'Courier New', monospace;
+            font-size: 10px;
+            color: #7f8c8d;
+            word-break: break-all;
+            margin-top: 8px;
+        }}
+        .unicode-input {{
+            width: 100%;
+            padding: 8px;
+            margin-top: 10px;
+            border: 1px solid #bdc3c7;
+            border-radius: 4px;
+            font-family: 'Courier New', monospace;
+            font-size: 14px;
+        }}
+        .unicode-input:focus {{
+            outline: none;
+            border-color: #3498db;
+            box-shadow: 0 0 5px rgba(52, 152, 219, 0.3);
+        }}
+        .instructions {{
+            background-color: #fff3cd;
+            border: 1px solid #ffeaa7;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }}
+        .instructions h3 {{
+            margin-top: 0;
+            color: #856404;
+        }}
+        .instructions ul {{
+            margin-bottom: 0;
+        }}
+        .instructions li {{
+            margin-bottom: 5px;
+        }}
+{url_type_css}    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>{title}</h1>
+        
+        <div class="stats">
+{stats}
+        </div>
+        
+        <div class="instructions">
+            <h3>Instructions for Manual Mapping:</h3>
+            <ul>
+                <li>Each character code is displayed with its corresponding image from pravenc.ru</li>
+                <li>Look at the image and identify what Church Slavonic character it represents</li>
+                <li>Enter the Unicode character or code in the input field below each image</li>
+                <li>You can use either the actual Unicode character (e.g., Ѣ) or the Unicode code (e.g., U+0462)</li>
+                <li>Save this file after completing the mapping for the next step</li>
+            </ul>
+        </div>
+        
+        <div class="character-grid">
+"""
+
+# Style and label for pages that show each item's URL type
+_URL_TYPE_CSS = """        .url-type {
+            font-size: 12px;
+            color: #e67e22;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+"""
+_URL_TYPE_LINE = """                <div class="url-type">{url_type}</div>
+"""
+
+# Markup for one character in the grid; formatted once per chunk
+_ITEM_TEMPLATE = """
+            <div class="character-item">
+{url_type_line}                <div class="code">{chunk}</div>
+                <div class="image-container">
+                    <img src="{image_url}" alt="Church Slavonic character {chunk}" class="character-image" 
+                         onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
+                    <div style="display:none; color:#e74c3c; font-size:12px;">Image not found</div>
+                </div>
+                <input type="text" class="unicode-input" placeholder="Enter Unicode character or code (e.g., Ѣ or U+0462)" 
+                       data-code="{chunk}" data-url="{image_url}">
+                <div class="url">{image_url}</div>
+            </div>
+"""
+
+# Ctrl+S reminder; it replaces the browser's save dialog with an alert
+_SAVE_SHORTCUT_JS = """            // Add keyboard shortcuts
+            document.addEventListener('keydown', function(e) {
+                if (e.ctrlKey && e.key === 's') {
+                    e.preventDefault();
+                    alert('Remember to save this file after completing the mapping!');
+                }
+            });
+            
+"""
+
+# The footer is not run through str.format (its script uses braces);
+# {save_shortcut} is substituted with str.replace
+_FOOTER = """
+        </div>
+        
+        <div style="margin-top: 40px; padding: 20px; background-color: #e8f5e8; border-radius: 5px;">
+            <h3>Mapping Progress</h3>
+            <p>After completing the mapping, you can extract the mappings using JavaScript:</p>
+            <pre style="background-color: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto;">
+// Run this in the browser console to extract mappings:
+const mappings = {};
+document.querySelectorAll('.unicode-input').forEach(input => {
+    if (input.value.trim()) {
+        mappings[input.dataset.code] = input.value.trim();
+    }
+});
+console.log(JSON.stringify(mappings, null, 2));
+            </pre>
+        </div>
+    </div>
+    
+    <script>
+        // Add some helpful functionality
+        document.addEventListener('DOMContentLoaded', function() {
+{save_shortcut}            // Add progress tracking
+            function updateProgress() {
+                const total = document.querySelectorAll('.unicode-input').length;
+                const filled = document.querySelectorAll('.unicode-input[value]').length;
+                const progress = Math.round((filled / total) * 100);
+                console.log(`Mapping progress: ${filled}/${total} (${progress}%)`);
+            }
+            
+            // Update progress on input
+            document.querySelectorAll('.unicode-input').forEach(input => {
+                input.addEventListener('input', updateProgress);
+            });
+        });
+    </script>
+</body>
+</html>
+"""
+
+
+def _iter_items(chunks, url_for, show_url_type):
+    """Yield the grid markup for each character code with its image."""
+    for chunk in chunks:
+        image_url, url_type = url_for(chunk)
+        url_type_line = _URL_TYPE_LINE.format(url_type=url_type) if show_url_type else ""
+        yield _ITEM_TEMPLATE.format(chunk=chunk, image_url=image_url, url_type_line=url_type_line)
+
+
+def build_mapping_html(chunks, url_for, output_file, title, stats_html, show_url_type=False, save_shortcut=False):
+    """
+    Write the mapping HTML for chunks to output_file.
+    url_for(chunk) returns the (image_url, url_type) pair shown for a chunk;
+    stats_html is inserted into the stats box. show_url_type labels each
+    item with its URL type, and save_shortcut adds the Ctrl+S reminder.
+    Returns True on success.
+    """
+    try:
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            # Stream the grid items straight into the buffered file instead
+            # of materializing the whole document in memory
+            f.write(_HEADER_TEMPLATE.format(
+                title=title,
+                stats=stats_html,
+                url_type_css=_URL_TYPE_CSS if show_url_type else "",
+            ))
+            f.writelines(_iter_items(chunks, url_for, show_url_type))
+            f.write(_FOOTER.replace("{save_shortcut}", _SAVE_SHORTCUT_JS if save_shortcut else ""))
+        return True
+    except Exception as e:
+        print(f"Error creating HTML file: {e}")
+        return False
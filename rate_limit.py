@@ -0,0 +1,25 @@
+"""
+Shared request pacing for the scraping scripts.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller may make its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next - now)
+            # Reserve the next slot before sleeping so other threads queue behind us
+            self._next = max(now, self._next) + self._interval
+        if wait:
+            time.sleep(wait)
@@ -3,25 +3,112 @@ import argparse
 import datetime as dt
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from bs4 import BeautifulSoup, Comment, SoupStrainer
+from markdownify import MarkdownConverter
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import yaml
 
+# libyaml's C emitter when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    )
+}
+
+
+def make_session(pool_size: int = 1) -> requests.Session:
+    """Return a Session with a pooled HTTPS adapter and the scraper's retry policy."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # Retry transient failures on the same pooled connection
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist={429, 502, 503, 504},
+            allowed_methods={"GET"},
+        ),
+    ))
+    return session
+
+
+# Module-wide Session, so repeated fetches reuse keep-alive connections
+_SESSION = make_session(16)
+
+# Patterns used for every article, compiled once
+_DASHES_RE = re.compile(r"-+")
+_URL_ID_RE = re.compile(r"/(\d+)(?:\.html)?$")
+_PAGE_RE = re.compile(r"С\.\s*([0-9,\s\-]+)")
+
+# Tags markdownify converts; everything else is reduced to its text
+_CONVERT_TAGS = ('br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre')
+
+# One converter with the options used for every article, instead of a new
+# MarkdownConverter (and options dict) per markdownify() call; it keeps no
+# per-conversion state, so worker threads can share it
+_CONVERTER = MarkdownConverter(heading_style="ATX", convert=_CONVERT_TAGS, bullets="-")
+_to_md = _CONVERTER.convert
+
+# Paragraph placed between parts converted in one markdownify call
+_PART_BREAK = "PRAVENCPARTBREAK"
+_PART_BREAK_HTML = f"<p>{_PART_BREAK}</p>"
+
+# Reference abbreviations and the headings they are rendered under
+_REFERENCE_HEADINGS = (("Соч.:", "Сочинения"), ("Ист.:", "Источники"), ("Лит.:", "Литература"))
+_REFERENCE_PREFIX_LEN = max(len(prefix) for prefix, _ in _REFERENCE_HEADINGS)
+
+# Only the blocks extract_fields reads are built into the tree; the site's
+# navigation and other page chrome are skipped while parsing. The class is
+# matched per token, so elements carrying extra classes are kept too
+_FIELDS_STRAINER = SoupStrainer(
+    ["h1", "div"],
+    class_=re.compile(r"(?:^|\s)(?:article_title|author|article_text|info)(?:\s|$)"),
+)
+
+_SLUG_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-._")
+
+
+class _SlugTable(dict):
+    """str.translate table: keep slug characters, map whitespace to '-', drop the rest."""
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        if char in _SLUG_CHARS:
+            value = char
+        elif char.isspace():
+            value = "-"
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_SLUG_TABLE = _SlugTable()
+
 
 def sanitize_filename(text: str) -> str:
-    text = text.strip().lower()
-    text = re.sub(r"\s+", "-", text)
-    text = re.sub(r"[^a-z0-9\-._]", "", text)
-    text = re.sub(r"-+", "-", text)
+    # One translate pass replaces the whitespace and non-slug substitutions
+    text = text.strip().lower().translate(_SLUG_TABLE)
+    text = _DASHES_RE.sub("-", text)
     return text[:120] or "article"
 
 
 def url_to_basename(url: str) -> str:
-    m = re.search(r"/(\d+)(?:\.html)?$", url)
+    m = _URL_ID_RE.search(url)
     if m:
         return m.group(1)
     last = url.rstrip("/").split("/")[-1]
@@ -30,14 +117,9 @@ def url_to_basename(url: str) -> str:
     return sanitize_filename(last)
 
 
-def fetch_html(url: str) -> str:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
-        )
-    }
-    resp = requests.get(url, headers=headers, timeout=30)
+def fetch_html(url: str, session: Optional[requests.Session] = None) -> str:
+    # Use the caller's Session when given (e.g. one per worker thread)
+    resp = (session or _SESSION).get(url, headers=_HEADERS, timeout=30)
     resp.encoding = resp.apparent_encoding or resp.encoding
     resp.raise_for_status()
     return resp.text
@@ -45,37 +127,26 @@ def fetch_html(url: str) -> str:
 
 def process_content_with_references(content_el: BeautifulSoup, base_url: str) -> str:
     """Process content element and convert reference divs to headings in place."""
-    # First, convert the main content to Markdown to find existing heading levels
-    main_content = content_el.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-    
-    # Find existing heading levels in the content
-    heading_levels = []
-    for element in main_content:
-        if element.name and element.name.startswith('h') and element.name[1:].isdigit():
-            level = int(element.name[1:])
-            heading_levels.append(level)
+    # Find the highest existing heading level in a single pass over the content
+    top_level = min((int(h.name[1]) for h in content_el.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])), default=None)
     
     # Determine reference heading level (one below the highest existing heading)
     # If there are headings, use one level below the minimum; otherwise use h1
-    if heading_levels:
-        reference_level = min(heading_levels) + 1
+    if top_level is not None:
         # Don't go beyond h6
-        reference_level = min(reference_level, 6)
+        reference_level = min(top_level + 1, 6)
     else:
         reference_level = 1
     reference_prefix = '#' * reference_level
     
-    # Find all reference divs in the content (they might be nested)
-    reference_divs = content_el.find_all('div', class_='reference')
-    
-    # Process content and build Markdown sections
+    # Collect the article's sections and references, to be converted together
     markdown_parts = []
     
     for child in content_el.children:
         if hasattr(child, 'name') and child.name == 'div' and child.get('class') and 'content' in child.get('class'):
             # Skip Содержание (Table of Contents) sections
             continue
-        elif hasattr(child, 'name') and child.name == 'div' and child.get_text(strip=True).startswith('Содержание'):
+        elif hasattr(child, 'name') and child.name == 'div' and _leading_text(child, len('Содержание')).startswith('Содержание'):
             # Skip any div that starts with "Содержание"
             continue
         elif hasattr(child, 'name') and child.name == 'div' and child.get('class') and 'toc' in child.get('class'):
@@ -86,31 +157,92 @@ def process_content_with_references(content_el: BeautifulSoup, base_url: str) ->
             continue
         elif hasattr(child, 'name') and child.name == 'div' and not child.get('class'):
             # This is likely the main content div - process it specially to handle nested references
-            process_nested_content(child, reference_divs, reference_prefix, base_url, markdown_parts)
+            process_nested_content(child, reference_prefix, base_url, markdown_parts)
         else:
             # Regular content - convert to Markdown
             if hasattr(child, 'name') and child.name:
-                child_md = md(
-                    str(child),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-                if child_md:
-                    markdown_parts.append(child_md)
+                markdown_parts.append((None, str(child)))
             elif str(child).strip():
                 # Handle text nodes
                 text_content = str(child).strip()
                 if text_content:
                     markdown_parts.append(text_content)
     
-    # Join all Markdown parts
-    content_md = '\n\n'.join(markdown_parts).strip()
+    return _render_parts(markdown_parts)
+
+
+def _leading_text(element: BeautifulSoup, length: int) -> str:
+    """Start of element.get_text(strip=True), at least length characters long
+    when the element has that much text.
+
+    Only the first text nodes are read, so checking how a large block starts
+    does not walk and join its whole subtree.
+    """
+    text = ""
+    for string in element.stripped_strings:
+        text += string
+        if len(text) >= length:
+            break
+    return text
+
+
+def _render_parts(parts: list) -> str:
+    """Convert the collected parts to Markdown and join them.
+
+    Each part is either Markdown text, or a (heading, html) tuple whose HTML
+    still has to be converted; heading is None for plain content sections.
+    All HTML goes through a single markdownify call, with a marker paragraph
+    between parts so the result can be split back apart.
+    """
+    fragments = [part[1] for part in parts if isinstance(part, tuple)]
+    converted = []
+    if fragments:
+        converted = _to_md(_PART_BREAK_HTML.join(fragments)).split(_PART_BREAK)
+        if len(converted) != len(fragments):
+            # Malformed markup swallowed a marker; convert the parts one by one
+            converted = [_to_md(fragment) for fragment in fragments]
+    converted = iter(converted)
+    
+    markdown_parts = []
+    for part in parts:
+        if not isinstance(part, tuple):
+            markdown_parts.append(part)
+            continue
+        heading, _ = part
+        part_md = next(converted).strip()
+        if heading is not None:
+            markdown_parts.append(f"{heading}\n\n{part_md}")
+        elif part_md:
+            markdown_parts.append(part_md)
+    
+    return '\n\n'.join(markdown_parts).strip()
+
+
+def _flush_section(current_section: list, markdown_parts: list) -> None:
+    """Append the buffered HTML section as a part and empty the buffer."""
+    if current_section:
+        markdown_parts.append((None, ''.join(current_section)))
+        current_section.clear()
+
+
+def _emit_reference(ref_div: BeautifulSoup, reference_prefix: str, base_url: str, markdown_parts: list) -> None:
+    """Append a reference div as a part with its heading."""
+    absolutize_urls(ref_div, base_url)
     
-    return content_md
+    # Detect literature type and remove abbreviation
+    ref_text = _leading_text(ref_div, _REFERENCE_PREFIX_LEN)
+    heading_text = "Литература"  # default
+    for prefix, heading in _REFERENCE_HEADINGS:
+        if ref_text.startswith(prefix):
+            heading_text = heading
+            # Remove the abbreviation from the content
+            strip_reference_prefix(ref_div, prefix)
+            break
+    
+    markdown_parts.append((f"{reference_prefix} {heading_text}", str(ref_div)))
 
 
-def process_nested_content(content_div: BeautifulSoup, reference_divs: list, reference_prefix: str, base_url: str, markdown_parts: list) -> None:
+def process_nested_content(content_div: BeautifulSoup, reference_prefix: str, base_url: str, markdown_parts: list) -> None:
     """Process a content div that may contain nested reference divs."""
     # Process content section by section
     current_section = []
@@ -118,96 +250,15 @@ def process_nested_content(content_div: BeautifulSoup, reference_divs: list, ref
     for element in content_div.children:
         if hasattr(element, 'name') and element.name == 'div' and element.get('class') and 'reference' in element.get('class'):
             # This is a direct reference div - add current section and then the reference
-            if current_section:
-                section_html = ''.join(current_section)
-                section_md = md(
-                    section_html,
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-                if section_md:
-                    markdown_parts.append(section_md)
-                current_section = []
-            
-            # Add the reference with appropriate heading
-            absolutize_urls(element, base_url)
-            
-            # Detect literature type and remove abbreviation
-            ref_text = element.get_text(strip=True)
-            heading_text = "Литература"  # default
-            
-            if ref_text.startswith("Соч.:"):
-                heading_text = "Сочинения"
-                # Remove the abbreviation from the content
-                element_copy = BeautifulSoup(str(element), 'html.parser')
-                # Find and remove text nodes that start with "Соч.:"
-                for text_node in element_copy.find_all(string=True):
-                    if text_node.strip().startswith("Соч.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Соч.:"
-                ref_md = md(
-                    str(element_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            elif ref_text.startswith("Ист.:"):
-                heading_text = "Источники"
-                # Remove the abbreviation from the content
-                element_copy = BeautifulSoup(str(element), 'html.parser')
-                for text_node in element_copy.find_all(string=True):
-                    if text_node.strip().startswith("Ист.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Ист.:"
-                ref_md = md(
-                    str(element_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            elif ref_text.startswith("Лит.:"):
-                heading_text = "Литература"
-                # Remove the abbreviation from the content
-                element_copy = BeautifulSoup(str(element), 'html.parser')
-                for text_node in element_copy.find_all(string=True):
-                    if text_node.strip().startswith("Лит.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Лит.:"
-                ref_md = md(
-                    str(element_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            else:
-                # No abbreviation found, use original content
-                ref_md = md(
-                    str(element),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            
-            markdown_parts.append(f"{reference_prefix} {heading_text}\n\n{ref_md}")
+            _flush_section(current_section, markdown_parts)
+            _emit_reference(element, reference_prefix, base_url, markdown_parts)
         elif hasattr(element, 'name') and element.name:
-            # Check if this element contains reference divs
-            refs_in_element = element.find_all('div', class_='reference')
-            
-            if refs_in_element:
-                # This element contains references - process it specially
-                # First add current section
-                if current_section:
-                    section_html = ''.join(current_section)
-                    section_md = md(
-                        section_html,
-                        heading_style="ATX",
-                        convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                        bullets="-",
-                    ).strip()
-                    if section_md:
-                        markdown_parts.append(section_md)
-                    current_section = []
-                
-                # Process the element with references
-                process_element_with_references(element, refs_in_element, reference_prefix, base_url, markdown_parts)
+            # Check if this element contains reference divs; find() stops at
+            # the first one, and most paragraphs contain none
+            if element.find('div', class_='reference') is not None:
+                # This element contains references - add current section, then process it specially
+                _flush_section(current_section, markdown_parts)
+                process_element_with_references(element, reference_prefix, base_url, markdown_parts)
             else:
                 # Regular content - add to current section
                 current_section.append(str(element))
@@ -215,19 +266,10 @@ def process_nested_content(content_div: BeautifulSoup, reference_divs: list, ref
             current_section.append(str(element))
     
     # Add any remaining content
-    if current_section:
-        section_html = ''.join(current_section)
-        section_md = md(
-            section_html,
-            heading_style="ATX",
-            convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-            bullets="-",
-        ).strip()
-        if section_md:
-            markdown_parts.append(section_md)
-
-
-def process_element_with_references(element: BeautifulSoup, reference_divs: list, reference_prefix: str, base_url: str, markdown_parts: list) -> None:
+    _flush_section(current_section, markdown_parts)
+
+
+def process_element_with_references(element: BeautifulSoup, reference_prefix: str, base_url: str, markdown_parts: list) -> None:
     """Process an element that contains reference divs."""
     # Process the element content section by section
     current_section = []
@@ -235,75 +277,8 @@ def process_element_with_references(element: BeautifulSoup, reference_divs: list
     for child in element.children:
         if hasattr(child, 'name') and child.name == 'div' and child.get('class') and 'reference' in child.get('class'):
             # This is a reference div - add current section and then the reference
-            if current_section:
-                section_html = ''.join(current_section)
-                section_md = md(
-                    section_html,
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-                if section_md:
-                    markdown_parts.append(section_md)
-                current_section = []
-            
-            # Add the reference with appropriate heading
-            absolutize_urls(child, base_url)
-            
-            # Detect literature type and remove abbreviation
-            ref_text = child.get_text(strip=True)
-            heading_text = "Литература"  # default
-            
-            if ref_text.startswith("Соч.:"):
-                heading_text = "Сочинения"
-                # Remove the abbreviation from the content
-                child_copy = BeautifulSoup(str(child), 'html.parser')
-                # Find and remove text nodes that start with "Соч.:"
-                for text_node in child_copy.find_all(string=True):
-                    if text_node.strip().startswith("Соч.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Соч.:"
-                ref_md = md(
-                    str(child_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            elif ref_text.startswith("Ист.:"):
-                heading_text = "Источники"
-                # Remove the abbreviation from the content
-                child_copy = BeautifulSoup(str(child), 'html.parser')
-                for text_node in child_copy.find_all(string=True):
-                    if text_node.strip().startswith("Ист.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Ист.:"
-                ref_md = md(
-                    str(child_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            elif ref_text.startswith("Лит.:"):
-                heading_text = "Литература"
-                # Remove the abbreviation from the content
-                child_copy = BeautifulSoup(str(child), 'html.parser')
-                for text_node in child_copy.find_all(string=True):
-                    if text_node.strip().startswith("Лит.:"):
-                        text_node.replace_with(text_node.strip()[5:])  # Remove "Лит.:"
-                ref_md = md(
-                    str(child_copy),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            else:
-                # No abbreviation found, use original content
-                ref_md = md(
-                    str(child),
-                    heading_style="ATX",
-                    convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-                    bullets="-",
-                ).strip()
-            
-            markdown_parts.append(f"{reference_prefix} {heading_text}\n\n{ref_md}")
+            _flush_section(current_section, markdown_parts)
+            _emit_reference(child, reference_prefix, base_url, markdown_parts)
         else:
             # Regular content - add to current section
             if hasattr(child, 'name') and child.name:
@@ -312,52 +287,45 @@ def process_element_with_references(element: BeautifulSoup, reference_divs: list
                 current_section.append(str(child))
     
     # Add any remaining content
-    if current_section:
-        section_html = ''.join(current_section)
-        section_md = md(
-            section_html,
-            heading_style="ATX",
-            convert=['br', 'p', 'a', 'img', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'strong', 'em', 'blockquote', 'code', 'pre'],
-            bullets="-",
-        ).strip()
-        if section_md:
-            markdown_parts.append(section_md)
+    _flush_section(current_section, markdown_parts)
+
+
+def strip_non_content(element: BeautifulSoup) -> None:
+    # Drop scripts, styles and HTML comments, which never reach the Markdown,
+    # so the conversion below walks a smaller tree
+    for tag in element.select("script, style, noscript"):
+        tag.decompose()
+    for comment in element.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+
+def strip_reference_prefix(element: BeautifulSoup, prefix: str) -> None:
+    # Remove the abbreviation (e.g. "Соч.:") from the reference's text nodes in
+    # place; the element is converted right after, so no copy is needed
+    for text_node in element.find_all(string=True):
+        if text_node.strip().startswith(prefix):
+            text_node.replace_with(text_node.strip()[len(prefix):])
+
+
+@lru_cache(maxsize=4096)
+def _abs(base_url: str, url: str) -> str:
+    """Absolute form of url for Markdown output; cached, as articles repeat
+    the same character-image URLs many times."""
+    absolute_url = urljoin(base_url, url)
+    # Wrap URLs with spaces in angle brackets for proper Markdown
+    return f"<{absolute_url}>" if " " in absolute_url else absolute_url
 
 
 def absolutize_urls(element: BeautifulSoup, base_url: str) -> None:
-    # Convert <a href> and <img src> (and common media) to absolute URLs
-    for tag in element.find_all(["a", "img", "source", "audio", "video"]):
-        if tag.name == "a" and tag.has_attr("href"):
-            absolute_url = urljoin(base_url, tag.get("href"))
-            # Wrap URLs with spaces in angle brackets for proper Markdown
-            if " " in absolute_url:
-                tag["href"] = f"<{absolute_url}>"
-            else:
-                tag["href"] = absolute_url
-        elif tag.name in ("img", "source") and tag.has_attr("src"):
-            absolute_url = urljoin(base_url, tag.get("src"))
-            if " " in absolute_url:
-                tag["src"] = f"<{absolute_url}>"
-            else:
-                tag["src"] = absolute_url
-        elif tag.name in ("audio", "video"):
-            if tag.has_attr("src"):
-                absolute_url = urljoin(base_url, tag.get("src"))
-                if " " in absolute_url:
-                    tag["src"] = f"<{absolute_url}>"
-                else:
-                    tag["src"] = absolute_url
-            for src in tag.find_all("source"):
-                if src.has_attr("src"):
-                    absolute_url = urljoin(base_url, src.get("src"))
-                    if " " in absolute_url:
-                        src["src"] = f"<{absolute_url}>"
-                    else:
-                        src["src"] = absolute_url
+    # Convert <a href> and <img src> (and common media) to absolute URLs;
+    # one selector pass also reaches <source> tags nested in <audio>/<video>
+    for tag in element.select("a[href], img[src], source[src], audio[src], video[src]"):
+        attr = "href" if tag.name == "a" else "src"
+        tag[attr] = _abs(base_url, tag[attr])
 
 
 def extract_fields(html: str, base_url: str) -> dict:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_FIELDS_STRAINER)
 
     title_el = soup.select_one("h1.article_title[itemprop=title]")
     author_els = soup.select("div.author")  # Get all author divs
@@ -367,7 +335,8 @@ def extract_fields(html: str, base_url: str) -> dict:
     if content_el is None:
         raise ValueError("Could not find div.article_text in the page")
 
-    # Make URLs absolute inside the content block before converting to Markdown
+    # Clean up and make URLs absolute inside the content block before converting to Markdown
+    strip_non_content(content_el)
     absolutize_urls(content_el, base_url)
 
     article_title = title_el.get_text(strip=True) if title_el else ""
@@ -403,7 +372,7 @@ def extract_fields(html: str, base_url: str) -> dict:
         
         # Find page numbers in format "С. [numbers]"
         info_text = info_el.get_text()
-        page_match = re.search(r"С\.\s*([0-9,\s\-]+)", info_text)
+        page_match = _PAGE_RE.search(info_text)
         if page_match:
             page_numbers = page_match.group(1).strip()
 
@@ -419,8 +388,17 @@ def extract_fields(html: str, base_url: str) -> dict:
     }
 
 
-def build_front_matter(article_title: str, author_html: str, volume: str, page_numbers: str, source_url: str) -> str:
-    author_text = BeautifulSoup(author_html, "html.parser").get_text(" ", strip=True) if author_html else ""
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string, as stored in downloaded_at."""
+    return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_front_matter(article_title: str, author_html: str, volume: str, page_numbers: str, source_url: str, downloaded_at: Optional[str] = None) -> str:
+    if "<" in author_html or "&" in author_html:
+        author_text = BeautifulSoup(author_html, "lxml").get_text(" ", strip=True)
+    else:
+        # extract_fields already hands over plain text; no need to parse it again
+        author_text = author_html.strip()
 
     data = {
         "article_title": article_title or None,
@@ -428,25 +406,39 @@ def build_front_matter(article_title: str, author_html: str, volume: str, page_n
         "volume": volume or None,
         "page_numbers": page_numbers or None,
         "source_url": source_url,
-        "downloaded_at": dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        # Batch callers pass one timestamp for the whole run
+        "downloaded_at": downloaded_at or utc_timestamp(),
     }
 
     data = {k: v for k, v in data.items() if v not in (None, "")}
-    yaml_str = yaml.safe_dump(data, allow_unicode=True, sort_keys=False).rstrip()
+    yaml_str = yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False).rstrip()
     return f"---\n{yaml_str}\n---\n"
 
 
 def save_markdown(output_dir: Path, base_name: str, front_matter: str, content_md: str) -> Path:
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # The caller creates output_dir once, rather than once per article
     out_path = output_dir / f"{base_name}.md"
-    with out_path.open("w", encoding="utf-8") as f:
-        f.write(front_matter)
-        f.write("\n")
-        f.write(content_md)
-        f.write("\n")
+    out_path.write_text(f"{front_matter}\n{content_md}\n", encoding="utf-8")
     return out_path
 
 
+def scrape(url: str, out_dir: str, session: Optional[requests.Session] = None, downloaded_at: Optional[str] = None) -> Path:
+    """Download a single article and save it as Markdown; return the output path.
+
+    out_dir must already exist.
+    """
+    html = fetch_html(url, session=session)
+    fields = extract_fields(html, base_url=url)
+    front_matter = build_front_matter(
+        article_title=fields["article_title"],
+        author_html=fields["author_html"],
+        volume=fields["volume"],
+        page_numbers=fields["page_numbers"],
+        source_url=url,
+        downloaded_at=downloaded_at,
+    )
+    base_name = url_to_basename(url)
+    return save_markdown(Path(out_dir), base_name, front_matter, fields["content_md"])
 
 
 def main(argv=None) -> int:
@@ -456,19 +448,9 @@ def main(argv=None) -> int:
     args = parser.parse_args(argv)
 
     # Single article download
-    url = args.url
     try:
-        html = fetch_html(url)
-        fields = extract_fields(html, base_url=url)
-        front_matter = build_front_matter(
-            article_title=fields["article_title"],
-            author_html=fields["author_html"],
-            volume=fields["volume"],
-            page_numbers=fields["page_numbers"],
-            source_url=url,
-        )
-        base_name = url_to_basename(url)
-        out_path = save_markdown(Path(args.out_dir), base_name, front_matter, fields["content_md"])
+        Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+        out_path = scrape(args.url, args.out_dir)
         print(str(out_path))
         return 0
     except Exception as e: